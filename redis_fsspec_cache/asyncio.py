@@ -1,9 +1,161 @@
-from typing import Callable, ClassVar, Optional
+import asyncio
+
+from collections.abc import Iterable
+from typing import Awaitable, Callable, ClassVar, Optional
 from fsspec import filesystem
-from fsspec.asyn import AsyncFileSystem
+from fsspec.asyn import AbstractAsyncStreamedFile, AsyncFileSystem, _run_coros_in_chunks
 
 from redis.asyncio import Redis
 
+from .sync.cache import PayloadMixin, _contiguous_runs
+from .sync.codec import Codec, make_codec
+from .utils import INVALIDATE_BATCH_SIZE, async_redis_client, path_digest
+
+AsyncFetcher = Callable[[int, int], Awaitable[bytes]]  # Maps (start, end) to bytes
+
+
+class AsyncRedisBlockCache(PayloadMixin):
+    """A block cache for async files that uses an async Redis client as a backend.
+
+    The async counterpart of ``redis_fsspec_cache.sync.cache.RedisBlockCache``,
+    for files whose fetcher is a coroutine function such as the ``_fetch_range``
+    of fsspec's AbstractAsyncStreamedFile. Blocks are stored under the same keys
+    and in the same format as the sync block cache, so both can share a redis
+    instance. Entries that are invalid, or compressed with a codec this cache
+    cannot decode, are treated as misses and replaced.
+
+    Parameters
+    ----------
+    blocksize : int
+        The number of bytes to store in each block.
+    fetcher : Callable
+        Coroutine function of the form f(start, end) which gets bytes from
+        the target file.
+    size : int
+        The total size of the file being cached.
+    filename : str
+        The name of the file to use as a key prefix in redis.
+    redis : redis.asyncio.Redis
+        An async redis client to use as a backend.
+    expiry : int
+        The time in seconds after which a redis copy is considered useless.
+        The default is equivalent to one week.
+    cache_key_prefix : str
+        The prefix to use for the keys in the redis cache. The default key
+        prefix is `fsspec-redis-cache`.
+    compressor : str or Codec
+        The codec to compress blocks with before writing them to redis, one
+        of 'none', 'zstd' or 'lz4', or a codec instance to share. Use the
+        same one as the sync caches sharing the redis instance.
+    """
+
+    name = "asyncredisblockcache"
+
+    def __init__(
+        self,
+        blocksize: int,
+        fetcher: AsyncFetcher,
+        size: int,
+        filename: str = None,
+        redis: Redis = None,
+        expiry: int = 604800,
+        cache_key_prefix: str = "fsspec-redis-cache",
+        compressor: str | Codec | None = None,
+    ) -> None:
+        self.blocksize = blocksize
+        self.fetcher = fetcher
+        self.size = size
+        self.redis = redis
+        self.filename = filename
+        self.expiry = expiry
+        self.cache_key_prefix = cache_key_prefix
+        self._key_prefix = f"{cache_key_prefix}-{filename}-".encode()
+        self.compressor = compressor
+        self._codec = make_codec(compressor)
+
+    def __repr__(self) -> str:
+        return f"<AsyncRedisBlockCache blocksize={self.blocksize}, size={self.size}>"
+
+    async def _fetch_async(self, start: int | None, stop: int | None) -> bytes:
+        if self.size is None:
+            # Blocks cannot be laid out without the file size
+            return await self.fetcher(start, stop)
+        if start is None:
+            start = 0
+        if stop is None:
+            stop = self.size
+        stop = min(stop, self.size)
+        if start >= stop:
+            return b""
+
+        start_block_number, start_block_offset = divmod(start, self.blocksize)
+        end_block_number = (stop - 1) // self.blocksize
+        block_numbers = range(start_block_number, end_block_number + 1)
+
+        keys = [self._key_prefix + b"%d" % i_block for i_block in block_numbers]
+        if self.expiry:
+            # GETEX refreshes the expiry of blocks that keep being read
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.getex(key, ex=self.expiry)
+                payloads = await pipe.execute()
+        else:
+            payloads = await self.redis.mget(keys)
+
+        blocks = [None] * len(keys)
+        stale = set()
+        for i, payload in enumerate(payloads):
+            if payload is not None:
+                blocks[i] = self._decode(payload, self._block_length(block_numbers[i]))
+                if blocks[i] is None:
+                    stale.add(i)
+
+        missing = [i for i, block in enumerate(blocks) if block is None]
+        if missing:
+            # Fetch every run of missing blocks concurrently, then cache the
+            # blocks in a single round trip
+            runs = list(_contiguous_runs(missing))
+            results = await asyncio.gather(
+                *[
+                    self.fetcher(
+                        block_numbers[first] * self.blocksize,
+                        min((block_numbers[last] + 1) * self.blocksize, self.size),
+                    )
+                    for first, last in runs
+                ]
+            )
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for (first, last), data in zip(runs, results):
+                    for i in range(first, last + 1):
+                        offset = (i - first) * self.blocksize
+                        blocks[i] = data[offset:offset + self.blocksize]
+                        if len(blocks[i]) != self._block_length(block_numbers[i]):
+                            continue
+                        # NX like the sync cache, except for invalid entries
+                        # which have to be replaced
+                        pipe.set(
+                            keys[i],
+                            self._encode(blocks[i]),
+                            ex=self.expiry or None,
+                            nx=i not in stale,
+                        )
+                if len(pipe):
+                    await pipe.execute()
+
+        end_block_offset = stop - end_block_number * self.blocksize
+        if len(blocks) == 1:
+            blocks[0] = memoryview(blocks[0])[start_block_offset:end_block_offset]
+        else:
+            blocks[0] = memoryview(blocks[0])[start_block_offset:]
+            blocks[-1] = memoryview(blocks[-1])[:end_block_offset]
+
+        return b"".join(blocks)
+
+    def _block_length(self, i_block: int) -> int:
+        """Returns the number of bytes in the given block, less than blocksize
+        only for the last block of the file."""
+        return min(self.blocksize, self.size - i_block * self.blocksize)
+
 
 class RedisAsyncCachingFilesystem(AsyncFileSystem):
     """An async fsspec filesystem that caches reads in a Redis instance.
@@ -31,6 +183,7 @@ class RedisAsyncCachingFilesystem(AsyncFileSystem):
         target_protocol: Optional[str] = None,
         target_options: Optional[dict] = None,
         fs: Optional[AsyncFileSystem] = None,
+        compressor: Optional[str | Codec] = None,
         **kwargs,
     ) -> None:
         """
@@ -58,6 +211,11 @@ class RedisAsyncCachingFilesystem(AsyncFileSystem):
             The options to use for the target filesystem.
         fs : fsspec.asyn.AsyncFileSystem
             Directly provide a filesystem to use as the target.
+        compressor : str or Codec
+            The codec to compress the blocks of files opened with
+            ``open_async`` with in redis, one of 'none', 'zstd' or 'lz4', or
+            a codec instance.
+            Use the same one as sync filesystems sharing the redis instance.
         kwargs : dict
             Additional keyword arguments to pass to the target filesystem.
         """
@@ -73,13 +231,16 @@ class RedisAsyncCachingFilesystem(AsyncFileSystem):
             )
 
         if redis is None:
-            self.redis = Redis(host=redis_host, port=redis_port, db=0)
+            self.redis = async_redis_client(redis_host, redis_port)
         else:
             self.redis = redis
 
         self.kwargs = target_options or {}
         self.expiry = expiry_time
         self.cache_key_prefix = cache_key_prefix
+        self._key_prefix = f"{cache_key_prefix}-".encode()
+        self.compressor = compressor
+        self._codec = make_codec(compressor)
 
         self.target_protocol = (
             target_protocol
@@ -102,6 +263,68 @@ class RedisAsyncCachingFilesystem(AsyncFileSystem):
         await self._put_cache(chunk, path, start, end)
         return chunk
 
+    async def _cat_ranges(
+        self,
+        paths,
+        starts,
+        ends,
+        max_gap=None,
+        batch_size=None,
+        on_error="return",
+        **kwargs,
+    ):
+        if max_gap is not None or not isinstance(paths, list):
+            return await super()._cat_ranges(
+                paths, starts, ends, max_gap=max_gap, batch_size=batch_size, on_error=on_error, **kwargs
+            )
+        if not isinstance(starts, Iterable):
+            starts = [starts] * len(paths)
+        if not isinstance(ends, Iterable):
+            ends = [ends] * len(paths)
+        if len(starts) != len(paths) or len(ends) != len(paths):
+            raise ValueError
+
+        # Look up every range in a single round trip, and only go to the
+        # target filesystem for the misses
+        keys = [self._cache_key(p, s, e) for p, s, e in zip(paths, starts, ends)]
+        out = await self.redis.mget(keys)
+        missing = [i for i, chunk in enumerate(out) if chunk is None]
+        if missing:
+            chunks = await self._fetch_missing(
+                [paths[i] for i in missing],
+                [starts[i] for i in missing],
+                [ends[i] for i in missing],
+                [keys[i] for i in missing],
+                batch_size=batch_size,
+                **kwargs,
+            )
+            for i, chunk in zip(missing, chunks):
+                out[i] = chunk
+
+        if on_error != "return":
+            ex = next((chunk for chunk in out if isinstance(chunk, BaseException)), None)
+            if ex is not None:
+                raise ex
+        return out
+
+    async def _fetch_missing(self, paths, starts, ends, keys, batch_size=None, **kwargs):
+        """
+        Fetches the given ranges from the target filesystem concurrently, at
+        most ``batch_size`` at a time, and caches them in a single round trip.
+        Failed ranges are returned as their exception and not cached.
+        """
+        coros = [
+            self.fs._cat_file(p, start=s, end=e, **kwargs)
+            for p, s, e in zip(paths, starts, ends)
+        ]
+        chunks = await _run_coros_in_chunks(
+            coros, batch_size=batch_size or self.batch_size, nofiles=True, return_exceptions=True
+        )
+        await self._put_many(
+            [(key, chunk) for key, chunk in zip(keys, chunks) if not isinstance(chunk, BaseException)]
+        )
+        return chunks
+
     async def _cp_file(self, path1, path2, **kwargs):
         return await self.fs._cp_file(path1, path2, **kwargs)
 
@@ -130,18 +353,59 @@ class RedisAsyncCachingFilesystem(AsyncFileSystem):
     async def _rm_file(self, path, **kwargs):
         return await self.fs._rm_file(path, **kwargs)
 
+    def _open(
+        self,
+        path,
+        mode="rb",
+        block_size=None,
+        autocommit=True,
+        cache_options=None,
+        **kwargs,
+    ):
+        return self.fs._open(
+            path,
+            mode=mode,
+            block_size=block_size,
+            autocommit=autocommit,
+            cache_options=cache_options,
+            **kwargs,
+        )
+
     async def open_async(self, path, mode="rb", **kwargs):
-        return await self.fs.open_async(path, mode, **kwargs)
+        f = await self.fs.open_async(path, mode, **kwargs)
+        if (
+            "r" in mode
+            and type(f)._fetch_range is not AbstractAsyncStreamedFile._fetch_range
+            and getattr(f, "blocksize", None)
+            and getattr(f, "size", None) is not None
+        ):
+            # Async files have no cache of their own and read every range
+            # through _fetch_range, so route that through redis. Files that
+            # read some other way, or do not know their block size and size,
+            # like s3fs's, are returned as they are
+            cache = AsyncRedisBlockCache(
+                f.blocksize,
+                f._fetch_range,
+                f.size,
+                self._strip_protocol(path),
+                self.redis,
+                self.expiry,
+                self.cache_key_prefix,
+                compressor=self._codec,
+            )
+            f._fetch_range = cache._fetch_async
+        return f
 
     def _cache_key(self, path, start=None, end=None):
         """
-        Returns the cache key for the given path.
+        Returns the cache key for the given path. The path is hashed so the
+        key length does not grow with the path.
         """
-        key = f"{self.cache_key_prefix}-{path}"
+        key = self._key_prefix + path_digest(path)
         if start is not None:
-            key += f"-{start}"
+            key += b"-%d" % start
         if end is not None:
-            key += f"-{end}"
+            key += b"-%d" % end
         return key
 
     async def _get_cached(self, path, start=None, end=None) -> bytes | None:
@@ -157,23 +421,38 @@ class RedisAsyncCachingFilesystem(AsyncFileSystem):
         Caches the file data for the given path.
         """
         key = self._cache_key(path, start, end)
-        await self.redis.set(key, data, ex=self.expiry)
+        await self.redis.set(key, data, ex=self.expiry or None)
+
+    async def _put_many(self, items):
+        """
+        Caches many ``(key, data)`` pairs in a single round trip.
+        """
+        if not items:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, data in items:
+                pipe.set(key, data, ex=self.expiry or None)
+            await pipe.execute()
 
     async def _cached_keys(self):
         """ 
         Returns the keys of all the cached files
         """
-        keys = await self.redis.keys(f"{self.cache_key_prefix}-*")
-        return keys
+        return [key async for key in self.redis.scan_iter(match=f"{self.cache_key_prefix}-*")]
 
     async def invalidate_cache(self):
         """
         Invalidates the cache for the current filesystem. All cached data
         with the same cache_key_prefix will be deleted.
         """
-        keys = await self.redis.keys(f"{self.cache_key_prefix}-*")
-        if keys:
-            await self.redis.delete(*keys)
+        batch = []
+        async for key in self.redis.scan_iter(match=f"{self.cache_key_prefix}-*", count=INVALIDATE_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= INVALIDATE_BATCH_SIZE:
+                await self.redis.unlink(*batch)
+                batch.clear()
+        if batch:
+            await self.redis.unlink(*batch)
 
     async def close_redis(self):
         """
@@ -5,6 +5,37 @@ import pickle
 from redis import Redis
 from fsspec.implementations.reference import ReferenceFileSystem
 
+from .utils import INVALIDATE_BATCH_SIZE, path_digest, redis_client
+
+
+def _encode(data) -> bytes:
+    """
+    Encodes a value for storage in redis. bytes and str values are stored
+    as is behind a one byte type tag, anything else is pickled behind its
+    own tag.
+    """
+    if isinstance(data, bytes):
+        return b"B" + data
+    if isinstance(data, str):
+        return b"S" + data.encode()
+    return b"P" + pickle.dumps(data)
+
+
+def _decode(data: bytes):
+    """
+    Decodes a value stored with _encode. Returns None for values without a
+    known tag, like entries written by older versions, which are never
+    unpickled and are treated as cache misses.
+    """
+    tag = data[:1]
+    if tag == b"B":
+        return data[1:]
+    if tag == b"S":
+        return data[1:].decode()
+    if tag == b"P":
+        return pickle.loads(data[1:])
+    return None
+
 
 class RedisCachingReferenceFileSystem(ReferenceFileSystem):
     """
@@ -62,12 +93,13 @@ class RedisCachingReferenceFileSystem(ReferenceFileSystem):
             self.source = "unknown"
 
         if redis is None:
-            self.redis = Redis(host=redis_host, port=redis_port, db=0)
+            self.redis = redis_client(redis_host, redis_port)
         else:
             self.redis = redis
 
         self.expiry = expiry_time
         self.cache_key_prefix = cache_key_prefix
+        self._key_prefix = f"{cache_key_prefix}-".encode() + path_digest(self.source) + b"-"
 
         try:
             super().__init__(**kwargs)
@@ -80,6 +112,9 @@ class RedisCachingReferenceFileSystem(ReferenceFileSystem):
 
 
     def cat(self, path, recursive=False, on_error="raise", **kwargs):
+        if isinstance(path, list) and not recursive and not any("*" in p for p in path):
+            return self._cat_many(path, on_error=on_error, **kwargs)
+
         cached = self._get_cached(path)
         if cached is not None:
             return cached
@@ -88,15 +123,45 @@ class RedisCachingReferenceFileSystem(ReferenceFileSystem):
         self._put_cache(chunk, path)
         return chunk
 
+    def _cat_many(self, paths, on_error="raise", **kwargs):
+        """
+        Fetches many paths, caching each of them separately. All the paths are
+        looked up in a single round trip, only the misses are read through the
+        reference filesystem, and they are cached in a single round trip.
+        """
+        keys = [self._cache_key(p) for p in paths]
+        out = {}
+        missing = []
+        for p, data in zip(paths, self.redis.mget(keys)):
+            value = None if data is None else _decode(data)
+            if value is None:
+                missing.append(p)
+            else:
+                out[p] = value
+        if not missing:
+            return out
+
+        fetched = super().cat(missing, on_error=on_error, **kwargs)
+        pipe = self.redis.pipeline(transaction=False)
+        for p, chunk in fetched.items():
+            if not isinstance(chunk, BaseException):
+                pipe.set(self._cache_key(p), _encode(chunk), ex=self.expiry or None)
+        pipe.execute()
+
+        out.update(fetched)
+        # Keep the order of the requested paths
+        return {p: out[p] for p in paths if p in out} | out
+
     def _cache_key(self, path, start=None, end=None):
         """
-        Returns the cache key for the given path.
+        Returns the cache key for the given path. The source and path are
+        hashed so the key length does not grow with them.
         """
-        key = f"{self.cache_key_prefix}-{self.source}-{path}"
+        key = self._key_prefix + path_digest(str(path))
         if start is not None:
-            key += f"-{start}"
+            key += b"-%d" % start
         if end is not None:
-            key += f"-{end}"
+            key += b"-%d" % end
         return key
 
     def _get_cached(self, path, start=None, end=None) -> bytes | None:
@@ -108,27 +173,31 @@ class RedisCachingReferenceFileSystem(ReferenceFileSystem):
         data = self.redis.get(key)
         if data is None:
             return None
-        return pickle.loads(data)
+        return _decode(data)
 
     def _put_cache(self, data, path, start=None, end=None):
         """
         Caches the file data for the given path.
         """
         key = self._cache_key(path, start, end)
-        self.redis.set(key, pickle.dumps(data), ex=self.expiry)
+        self.redis.set(key, _encode(data), ex=self.expiry or None)
 
     def _cached_keys(self):
         """ 
         Returns the keys of all the cached files
         """
-        keys = self.redis.keys(f"{self.cache_key_prefix}-*")
-        return keys
+        return list(self.redis.scan_iter(match=f"{self.cache_key_prefix}-*"))
 
     def invalidate_cache(self):
         """
         Invalidates the cache for the current filesystem. All cached data
         with the same cache_key_prefix will be deleted.
         """
-        keys = self.redis.keys(f"{self.cache_key_prefix}-*")
-        if keys:
-            self.redis.delete(*keys)
+        batch = []
+        for key in self.redis.scan_iter(match=f"{self.cache_key_prefix}-*", count=INVALIDATE_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= INVALIDATE_BATCH_SIZE:
+                self.redis.unlink(*batch)
+                batch.clear()
+        if batch:
+            self.redis.unlink(*batch)
@@ -1,13 +1,204 @@
-from typing import Callable
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
 from fsspec.caching import BaseCache
 from redis import Redis
+from redis.client import Pipeline
+
+from ..utils import path_digest
+from .codec import Codec, make_codec
 
 # IDK not exported from fsspec
 # https://github.com/fsspec/filesystem_spec/blob/5df4b0b30dc011f9d6eceded5a078e92b2b5c11d/fsspec/caching.py#L36
 Fetcher = Callable[[int, int], bytes]  # Maps (start, end) to bytes
 
+# Number of not yet admitted blocks whose misses are remembered by an
+# AdmissionFilter
+ADMISSION_STASH_SIZE = 16384
+
+# Upper bound for the number of blocks fetched per miss by adaptive fetching
+MAX_FETCH_MULTIPLIER = 8
+
+# Concatenates the blocks stored under the first ARGV[1] KEYS on the server,
+# refreshing their expiry when ARGV[2] is set. The expiry of the remaining
+# KEYS, blocks read from memory, is refreshed too. Replies nil as soon as a
+# block is missing.
+ASSEMBLE_BLOCKS_SCRIPT = """
+local n = tonumber(ARGV[1])
+for i = n + 1, #KEYS do
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+local blocks = {}
+for i = 1, n do
+    local block
+    if ARGV[2] then
+        block = redis.call('GETEX', KEYS[i], 'EX', ARGV[2])
+    else
+        block = redis.call('GET', KEYS[i])
+    end
+    if not block then
+        return false
+    end
+    blocks[i] = block
+end
+return table.concat(blocks)
+"""
+
+
+def _contiguous_runs(indices: list[int]) -> Iterator[tuple[int, int]]:
+    """Yield ``(first, last)`` for each run of consecutive sorted indices."""
+    first = last = indices[0]
+    for i in indices[1:]:
+        if i != last + 1:
+            yield first, last
+            first = i
+        last = i
+    yield first, last
+
+
+class PayloadMixin:
+    """Converts between cached data and the payloads stored in redis, shared
+    by the sync and async caches so they can read each other's entries."""
+
+    _codec: Codec | None
+
+    def _encode(self, data: bytes) -> bytes:
+        """Returns the payload to store in redis for the given data."""
+        return data if self._codec is None else self._codec.encode(data)
+
+    def _decode(self, payload: bytes, length: int) -> bytes | None:
+        """Returns the data stored in the given redis payload, None when the
+        payload is not a valid entry of ``length`` bytes, such as a truncated
+        write or an entry from an older version, so it is treated as a miss."""
+        data = payload if self._codec is None else self._codec.decode(payload)
+        if data is None or len(data) != length:
+            return None
+        return data
+
+
+class AdmissionFilter:
+    """Counts the misses of blocks that are not cached in redis yet.
+
+    A filter is shared by all the caches of a filesystem, so the misses of a
+    block add up across every open of its file rather than each open file
+    starting from zero.
+
+    Parameters
+    ----------
+    threshold : int
+        The number of misses after which a block is admitted to redis.
+    """
+
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self._misses: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def admit(self, key: bytes) -> bool:
+        """Counts a miss of the block stored under ``key``, returning whether
+        the block has now missed often enough to be written to redis."""
+        if self.threshold <= 1:
+            return True
+        with self._lock:
+            misses = self._misses.pop(key, 0) + 1
+            if misses >= self.threshold:
+                return True
+            self._misses[key] = misses
+            while len(self._misses) > ADMISSION_STASH_SIZE:
+                self._misses.popitem(last=False)
+        return False
+
+    def ready(self, key: bytes) -> bool:
+        """Returns whether the next miss of the block stored under ``key`` will
+        admit it, without counting a miss."""
+        return self.threshold <= 1 or self._misses.get(key, 0) + 1 >= self.threshold
+
+    def track(self, key: bytes) -> None:
+        """Remembers that the block stored under ``key`` is not in redis, for
+        blocks fetched speculatively, without counting a miss. Later reads of
+        the block from memory then count towards its admission."""
+        with self._lock:
+            if key not in self._misses:
+                self._misses[key] = 0
+                while len(self._misses) > ADMISSION_STASH_SIZE:
+                    self._misses.popitem(last=False)
+
+    def pending(self, key: bytes) -> bool:
+        """Returns whether the block stored under ``key`` has missed without
+        being admitted yet."""
+        return key in self._misses
+
+
+class RedisCacheMixin(PayloadMixin):
+    """Helpers shared by the caches that store their data in redis."""
+
+    redis: Redis
+    expiry: int
+    _pipes: threading.local
+
+    @contextmanager
+    def _pipeline(self) -> Iterator[Pipeline]:
+        """Yields the calling thread's non-transactional pipeline, creating it
+        on first use. The pipeline is reused across calls rather than built for
+        every round trip. Each thread gets its own, so the round trips of a
+        read and of read-ahead in the background still run concurrently."""
+        pipe = getattr(self._pipes, "pipe", None)
+        if pipe is None:
+            pipe = self._pipes.pipe = self.redis.pipeline(transaction=False)
+        try:
+            yield pipe
+        finally:
+            pipe.reset()
 
-class RedisBlockCache(BaseCache):
+    def _get(self, key: bytes | str) -> bytes | None:
+        """Returns the payload cached under ``key``, refreshing its expiry so
+        entries that keep being read do not expire."""
+        if self.expiry:
+            return self.redis.getex(key, ex=self.expiry)
+        return self.redis.get(key)
+
+    def _get_many(self, keys: list[bytes], touch: Iterable[bytes] = ()) -> list[bytes | None]:
+        """Returns the payloads cached under ``keys`` in one round trip,
+        refreshing their expiry like ``_get``. The expiry of the ``touch``
+        keys is refreshed in the same round trip."""
+        if not self.expiry:
+            return self.redis.mget(keys)
+        with self._pipeline() as pipe:
+            for key in keys:
+                pipe.getex(key, ex=self.expiry)
+            for key in touch:
+                pipe.expire(key, self.expiry)
+            return pipe.execute()[:len(keys)]
+
+    def _get_or_fill(self, key: bytes | str, fill: Callable[[], bytes], length: int) -> bytes:
+        """Returns the ``length`` bytes cached under ``key``, calling ``fill``
+        and caching its result when the key is missing or invalid.
+
+        This makes exactly one GET per lookup, a None reply already means the
+        key is missing. Never put an EXISTS check in front of it: that doubles
+        the round trips of every hit, and the key can still expire between the
+        two commands.
+
+        The value is written with NX, so when several readers miss the same
+        key at once the first write wins and the others leave it alone. An
+        invalid entry is overwritten instead, NX would keep it forever. Values
+        that are not ``length`` bytes long are returned but not cached.
+        """
+        payload = self._get(key)
+        if payload is not None:
+            value = self._decode(payload, length)
+            if value is not None:
+                return value
+        value = fill()
+        if len(value) == length:
+            self.redis.set(key, self._encode(value), ex=self.expiry or None, nx=payload is None)
+        return value
+
+
+class RedisBlockCache(RedisCacheMixin, BaseCache):
     """A block cache that uses Redis as a backend.
 
     Adapted from fsspec.caching.BlockCache which uses an inmemory LRUCache as a backend
@@ -23,8 +214,9 @@ class RedisBlockCache(BaseCache):
     size : int
         The total size of the file being cached.
     maxblocks : int
-        The maximum number of blocks to cache for. The maximum memory
-        use for this cache is then ``blocksize * maxblocks``.
+        The maximum number of recently used blocks to keep in memory in
+        front of redis. The maximum memory use for this cache is then
+        ``blocksize * maxblocks``. The default of 0 always reads from redis.
     filename : str
         The name of the file to use as a key prefix in redis.
     redis : Redis
@@ -37,6 +229,33 @@ class RedisBlockCache(BaseCache):
         The prefix to use for the keys in the redis cache. This is useful
         when using the same redis instance for multiple caches. The default
         key prefix is `fsspec-redis-cache`.
+    readahead_blocks : int
+        The number of blocks to prefetch into redis in the background once
+        the file is being read sequentially, that is a read starts in the
+        block after the one the previous read ended in. The default of 0
+        disables read-ahead.
+    admission_threshold : int
+        The number of times a block has to miss before it is written to
+        redis. Raising this above 1 keeps one-off scans of large files from
+        evicting hot blocks of other files. The default of 0 writes every
+        block on its first miss.
+    admission : AdmissionFilter
+        The filter counting misses towards ``admission_threshold``. Pass the
+        same filter to the caches of every open of a file so their misses
+        add up, by default each cache counts on its own.
+    adaptive_fetch : bool
+        Whether to keep hit and miss counts for the file in redis, and to
+        fetch more blocks per miss on later opens of files whose reads keep
+        missing long runs of blocks.
+    compressor : str or Codec
+        The codec to compress blocks with before writing them to redis, one
+        of 'none', 'zstd' or 'lz4', or a codec instance to share. 'zstd'
+        requires the zstandard package and 'lz4' the lz4 package.
+    server_assembly : bool
+        Concatenate the blocks of a read that are not held in memory with a
+        Lua script on the redis server, so a read spanning many blocks gets a
+        single reply. Reads that miss any block fall back to fetching the
+        blocks one by one. Only used without a compressor.
     """
 
     name = "redisblockcache"
@@ -50,12 +269,57 @@ class RedisBlockCache(BaseCache):
         redis: Redis = None,
         expiry: int = 604800,
         cache_key_prefix: str = "fsspec-redis-cache",
+        readahead_blocks: int = 0,
+        maxblocks: int = 0,
+        admission_threshold: int = 0,
+        adaptive_fetch: bool = False,
+        compressor: str | Codec | None = None,
+        server_assembly: bool = False,
+        admission: AdmissionFilter | None = None,
     ) -> None:
         super().__init__(blocksize, fetcher, size)
         self.redis = redis
         self.filename = filename
         self.expiry = expiry
         self.cache_key_prefix = cache_key_prefix
+        self.readahead_blocks = readahead_blocks
+        self._key_prefix = f"{cache_key_prefix}-{filename}-".encode()
+        self._executor: ThreadPoolExecutor | None = None
+        self._last_end_block: int | None = None
+        self._readahead_until = -1
+        self._prefetching: dict[int, Future] = {}
+        self.maxblocks = maxblocks
+        self._local: OrderedDict[int, bytes] = OrderedDict()
+        # The blocks loaded by prefetch, kept whatever maxblocks is
+        self._prefetched: dict[int, bytes] = {}
+        self._local_lock = threading.Lock()
+        self._pipes = threading.local()
+        self._touched: set[int] = set()
+        self.admission_threshold = admission_threshold
+        self._admission = admission if admission is not None else AdmissionFilter(admission_threshold)
+        self._last_block = (size - 1) // blocksize
+        self.adaptive_fetch = adaptive_fetch
+        self._stats_key = self._key_prefix + b"stats"
+        self._stats = {"hits": 0, "misses": 0, "runs": 0}
+        self._fetch_multiplier = self._negotiate_fetch_multiplier() if adaptive_fetch else 1
+        self.compressor = compressor
+        self._codec = make_codec(compressor)
+        self.server_assembly = server_assembly
+        # Registering only computes the script hash, it is loaded into redis
+        # on first use
+        self._assemble_script = (
+            redis.register_script(ASSEMBLE_BLOCKS_SCRIPT)
+            if server_assembly and self._codec is None
+            else None
+        )
+
+    def close(self) -> None:
+        """Stops the read-ahead thread and drops the prefetched blocks, called
+        by fsspec when the file is closed."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._prefetched.clear()
 
     def __repr__(self) -> str:
         return (
@@ -64,39 +328,348 @@ class RedisBlockCache(BaseCache):
         )
 
     def _fetch(self, start: int | None, stop: int | None) -> bytes:
+        # Every read goes through here, bind the attributes used repeatedly
+        blocksize = self.blocksize
+        size = self.size
         if start is None:
             start = 0
-        if stop is None:
-            stop = self.size
-        if start >= self.size or start >= stop:
+        if stop is None or stop > size:
+            stop = size
+        if start >= stop:
             return b""
 
-        # byte position -> block numbers
-        start_block_number = start // self.blocksize
-        start_block_offset = start % self.blocksize
-        end_block_number = stop // self.blocksize
+        # byte position -> block numbers, the end block being the one holding
+        # the last requested byte so a read ending on a block boundary, or at
+        # the end of the file, does not fetch the block after it
+        start_block_number, start_block_offset = divmod(start, blocksize)
+        end_block_number = (stop - 1) // blocksize
+
+        prefetching = self._prefetching
+        if prefetching:
+            # Let in-flight read-ahead of the requested blocks land rather
+            # than fetching the same blocks twice
+            with self._local_lock:
+                in_flight = {
+                    prefetching[i_block]
+                    for i_block in range(start_block_number, end_block_number + 1)
+                    if i_block in prefetching
+                }
+            wait(in_flight)
+
+        blocks = self._fetch_blocks(start_block_number, end_block_number)
+        if self.readahead_blocks:
+            self._read_ahead(start_block_number, end_block_number)
+
+        # Only the first and last blocks need trimming to the requested range,
+        # through memoryviews so the join into the returned bytes is the only
+        # copy, and the per-block work happens in C
+        end_block_offset = stop - end_block_number * blocksize
+        if len(blocks) == 1:
+            blocks[0] = memoryview(blocks[0])[start_block_offset:end_block_offset]
+        else:
+            blocks[0] = memoryview(blocks[0])[start_block_offset:]
+            blocks[-1] = memoryview(blocks[-1])[:end_block_offset]
+
+        return b"".join(blocks)
+
+    def prefetch(self, start: int, stop: int) -> None:
+        """Loads the blocks covering the byte range ``start..stop`` into
+        memory ahead of any reads, fetching the missing ones in one request.
+        The blocks stay in memory until the file is closed, independently of
+        ``maxblocks``."""
+        stop = min(stop, self.size)
+        if start >= stop:
+            return
+        first_block = start // self.blocksize
+        blocks = self._fetch_blocks(first_block, (stop - 1) // self.blocksize, speculative=True)
+        with self._local_lock:
+            self._prefetched.update(enumerate(blocks, first_block))
+
+    def _assemble_blocks(
+        self, keys: list[bytes], touch: Iterable[bytes], lengths: list[int]
+    ) -> list[memoryview] | None:
+        """Returns the blocks stored under ``keys``, concatenated by redis and
+        split back into blocks of the given ``lengths``. The blocks are
+        memoryviews of the reply, so the reply is not copied. The expiry of
+        the ``touch`` keys is refreshed in the same round trip. Returns None
+        when any of the blocks is missing, or the reply is not as long as the
+        blocks, which means a block is invalid."""
+        args = [len(keys), self.expiry] if self.expiry else [len(keys)]
+        data = self._assemble_script(keys=keys + list(touch), args=args)
+        if data is None or len(data) != sum(lengths):
+            return None
+        view = memoryview(data)
+        blocks = []
+        offset = 0
+        for length in lengths:
+            blocks.append(view[offset:offset + length])
+            offset += length
+        return blocks
+
+    def _fetch_blocks(
+        self, first_block: int, last_block: int, speculative: bool = False
+    ) -> list[bytes]:
+        """Returns the blocks ``first_block..last_block``, looking them up in
+        memory, then in redis, and filling the rest using the fetcher.
+
+        ``speculative`` is set for reads ahead of demand, read-ahead and
+        prefetch, whose misses do not count towards admission."""
+        block_numbers = range(first_block, last_block + 1)
+        blocks = self._get_local(block_numbers)
+
+        remote = [i for i, block in enumerate(blocks) if block is None]
+        if self.expiry:
+            # Blocks served from memory are read without redis seeing it, so
+            # their expiry is refreshed along with the next redis lookup
+            with self._local_lock:
+                self._touched.update(
+                    block_numbers[i] for i, block in enumerate(blocks) if block is not None
+                )
+                if remote:
+                    touched, self._touched = self._touched, set()
+        if self._admission.threshold > 1:
+            self._admit_local(block_numbers, blocks)
+        if not remote:
+            return blocks
+
+        keys = [self._block_key(block_numbers[i]) for i in remote]
+        stale = set()
+        touch = [self._block_key(i_block) for i_block in touched] if self.expiry else ()
+        if self._assemble_script is not None and len(remote) > 1:
+            assembled = self._assemble_blocks(
+                keys, touch, [self._block_length(block_numbers[i]) for i in remote]
+            )
+            if assembled is not None:
+                for i, block in zip(remote, assembled):
+                    blocks[i] = block
+                self._put_local([(block_numbers[i], blocks[i]) for i in remote])
+                return blocks
+            # The script already refreshed these, fall back to fetching the
+            # blocks one by one to find the missing or invalid ones
+            touch = ()
+        for i, payload in zip(remote, self._get_many(keys, touch)):
+            if payload is not None:
+                blocks[i] = self._decode(payload, self._block_length(block_numbers[i]))
+                if blocks[i] is None:
+                    stale.add(block_numbers[i])
+
+        missing = [i for i, block in enumerate(blocks) if block is None]
+        fetched = [(block_numbers[i], blocks[i]) for i in remote if blocks[i] is not None]
+        if missing:
+            # Fill the misses from the backend, then write the admitted ones
+            # back to redis in a single round trip
+            blocksize = self.blocksize
+            writes = []
+            runs = list(_contiguous_runs(missing))
+            for first, last in runs:
+                run_first, run_last = block_numbers[first], block_numbers[last]
+                if last == len(block_numbers) - 1:
+                    # Files that keep missing long runs get more blocks
+                    # fetched past the end of the read
+                    run_last = max(run_last, min(run_first + self._fetch_multiplier - 1, self._last_block))
+
+                # One backend request per run of missing blocks, split back
+                # into blocks so they are cached individually
+                data = self.fetcher(
+                    run_first * blocksize,
+                    min((run_last + 1) * blocksize, self.size),
+                )
+                for i_block in range(run_first, run_last + 1):
+                    offset = (i_block - run_first) * blocksize
+                    block = data[offset:offset + blocksize]
+                    if i_block <= last_block:
+                        blocks[i_block - first_block] = block
+                    fetched.append((i_block, block))
+                    if len(block) == self._block_length(i_block) and self._admit_fetched(
+                        self._block_key(i_block),
+                        # blocks past the end of the read are not demanded yet
+                        speculative or i_block > last_block,
+                    ):
+                        writes.append((i_block, self._encode(block)))
+            with self._pipeline() as pipe:
+                for i_block, payload in writes:
+                    # NX: a concurrent reader that already cached the block
+                    # wins, rewriting the same bytes is wasted work. Invalid
+                    # entries have to be overwritten though
+                    pipe.set(
+                        self._block_key(i_block),
+                        payload,
+                        ex=self.expiry or None,
+                        nx=i_block not in stale,
+                    )
+                if self.adaptive_fetch:
+                    self._flush_stats(pipe, len(remote) - len(missing), len(missing), len(runs))
+                if len(pipe):
+                    pipe.execute()
+        elif self.adaptive_fetch:
+            self._flush_stats(None, len(remote), 0, 0)
+
+        self._put_local(fetched)
+        return blocks
+
+    def _flush_stats(self, pipe, hits: int, misses: int, runs: int) -> None:
+        """Counts the outcome of a redis lookup. The counts are only written to
+        redis along with the writes of a pipeline, so they never cost a round
+        trip of their own."""
+        with self._local_lock:
+            self._stats["hits"] += hits
+            self._stats["misses"] += misses
+            self._stats["runs"] += runs
+            if pipe is None:
+                return
+            for field, count in self._stats.items():
+                if count:
+                    pipe.hincrby(self._stats_key, field, count)
+                self._stats[field] = 0
+        if self.expiry:
+            pipe.expire(self._stats_key, self.expiry)
+
+    def _negotiate_fetch_multiplier(self) -> int:
+        """Returns the number of blocks to fetch per miss for this file, doubling
+        it when most lookups of the file so far missed in long runs."""
+        hits, misses, runs, multiplier = (
+            int(value or 0)
+            for value in self.redis.hmget(self._stats_key, "hits", "misses", "runs", "multiplier")
+        )
+        multiplier = max(multiplier, 1)
+        if (
+            multiplier < MAX_FETCH_MULTIPLIER
+            and misses > hits
+            and runs
+            and misses / runs > 4
+        ):
+            multiplier = min(multiplier * 2, MAX_FETCH_MULTIPLIER)
+            # Start counting afresh so the next doubling is based on reads made
+            # with the new multiplier
+            with self._pipeline() as pipe:
+                pipe.hdel(self._stats_key, "hits", "misses", "runs")
+                pipe.hset(self._stats_key, "multiplier", multiplier)
+                if self.expiry:
+                    pipe.expire(self._stats_key, self.expiry)
+                pipe.execute()
+        return multiplier
+
+    def _get_local(self, block_numbers: range) -> list[bytes | None]:
+        """Returns the in-memory copies of the given blocks, None for the blocks
+        that are not held locally."""
+        blocks = []
+        with self._local_lock:
+            for i_block in block_numbers:
+                block = self._prefetched.get(i_block)
+                if block is None:
+                    block = self._local.get(i_block)
+                    if block is not None:
+                        self._local.move_to_end(i_block)
+                blocks.append(block)
+        return blocks
+
+    def _put_local(self, items: list[tuple[int, bytes]]) -> None:
+        """Keeps in-memory copies of the given ``(block_number, block)`` pairs,
+        evicting the least recently used blocks past ``maxblocks``."""
+        if not self.maxblocks:
+            return
+        with self._local_lock:
+            for i_block, block in items:
+                self._local[i_block] = block
+                self._local.move_to_end(i_block)
+            while len(self._local) > self.maxblocks:
+                self._local.popitem(last=False)
+
+    def _admit_fetched(self, key: bytes, speculative: bool) -> bool:
+        """Returns whether a block just fetched from the backend is written to
+        redis. A speculative fetch is only written when the block's next miss
+        would admit it anyway, and otherwise does not count as a miss."""
+        if not speculative or self._admission.ready(key):
+            return self._admission.admit(key)
+        self._admission.track(key)
+        return False
+
+    def _admit_local(self, block_numbers: range, blocks: list[bytes | None]) -> None:
+        """Counts the reads of blocks served from memory that are not in redis
+        yet as misses, and writes the ones that are now admitted to redis.
+        Without this, a block kept in memory would never be admitted."""
+        writes = []
+        for i_block, block in zip(block_numbers, blocks):
+            if block is None:
+                continue
+            key = self._block_key(i_block)
+            if self._admission.pending(key) and self._admission.admit(key):
+                writes.append((key, self._encode(block)))
+        if writes:
+            with self._pipeline() as pipe:
+                for key, payload in writes:
+                    pipe.set(key, payload, ex=self.expiry or None, nx=True)
+                pipe.execute()
+
+    def _block_length(self, i_block: int) -> int:
+        """Returns the number of bytes in the given block, less than blocksize
+        only for the last block of the file."""
+        return min(self.blocksize, self.size - i_block * self.blocksize)
+
+    def _block_key(self, i_block: int) -> bytes:
+        return self._key_prefix + b"%d" % i_block
+
+    def _read_ahead(self, start_block: int, end_block: int) -> None:
+        """Prefetches the blocks following a sequential read in the background,
+        so that the next read finds them in redis."""
+        # Reads within the block the last read ended in, like the many small
+        # header reads of HDF5 or netCDF, do not count as sequential
+        sequential = (
+            self._last_end_block is not None and start_block == self._last_end_block + 1
+        )
+        self._last_end_block = end_block
+        if not sequential:
+            # Random access, start over instead of prefetching blocks that
+            # will likely never be read
+            self._readahead_until = end_block
+            return
 
-        blocks = bytearray()
-        for i_block in range(start_block_number, end_block_number + 1):
-            # TODO: ASYNC???
-            block = self._fetch_cache_block(i_block)
-            blocks.extend(block)
+        first_block = max(end_block, self._readahead_until) + 1
+        last_block = min(end_block + self.readahead_blocks, self._last_block)
+        if first_block > last_block:
+            return
 
-        all_bytes = bytes(blocks)
+        if self._admission.threshold > 1:
+            # Only read ahead the blocks that would be admitted to redis, the
+            # others would be fetched for nothing and fetched again on demand
+            ready_until = first_block - 1
+            while ready_until < last_block and self._admission.ready(
+                self._block_key(ready_until + 1)
+            ):
+                ready_until += 1
+            last_block = ready_until
+            if first_block > last_block:
+                return
+        self._readahead_until = last_block
 
-        return all_bytes[start_block_offset:start_block_offset + (stop - start)]
+        with self._local_lock:
+            # Skip the blocks a previous read-ahead is still fetching
+            block_numbers = [
+                i_block
+                for i_block in range(first_block, last_block + 1)
+                if i_block not in self._prefetching
+            ]
+            if not block_numbers:
+                return
 
-    def _fetch_cache_block(self, i_block: int) -> bytes:
-        block = self.redis.get(f"{self.cache_key_prefix}-{self.filename}-{i_block}")
-        if block is None:
-            block = self.fetcher(
-                i_block * self.blocksize, (i_block + 1) * self.blocksize
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            future = self._executor.submit(
+                self._fetch_blocks, block_numbers[0], block_numbers[-1], speculative=True
             )
-            self.redis.set(f"{self.cache_key_prefix}-{self.filename}-{i_block}", block, ex=self.expiry)
-        return block
+            for i_block in block_numbers:
+                self._prefetching[i_block] = future
 
+        def done(_):
+            with self._local_lock:
+                for i_block in block_numbers:
+                    if self._prefetching.get(i_block) is future:
+                        del self._prefetching[i_block]
 
-class RedisChunkCache(BaseCache):
+        future.add_done_callback(done)
+
+
+class RedisChunkCache(RedisCacheMixin, BaseCache):
     """A cache that uses Redis as a backend and caches exact chunks.
 
     Chunks are cached as ranges are requested exactly. This is specifically useful 
@@ -113,7 +686,7 @@ class RedisChunkCache(BaseCache):
     size : int
         The total size of the file being cached.
     filename : str
-        The name of the file to use as a key prefix in redis.
+        The name of the file, hashed into the key prefix in redis.
     redis : Redis
         A redis client to use as a backend.
     expiry : int
@@ -124,6 +697,18 @@ class RedisChunkCache(BaseCache):
         The prefix to use for the keys in the redis cache. This is useful
         when using the same redis instance for multiple caches. The default
         key prefix is `fsspec-redis-cache`.
+    maxchunks : int
+        The maximum number of recently read chunks to keep in memory in front
+        of redis, so that repeated reads of the same range, such as metadata,
+        skip the redis round trip. The default of 0 always reads from redis.
+    compressor : str or Codec
+        The codec to compress chunks with before writing them to redis, one
+        of 'none', 'zstd' or 'lz4', or a codec instance to share.
+    alignment : int
+        When set, requested ranges are widened to multiples of this many
+        bytes before being cached, so reads that overlap without matching
+        exactly are served from the same chunk. The default of 0 caches the
+        exact ranges requested.
     """
 
     name = "redischunkcache"
@@ -142,12 +727,24 @@ class RedisChunkCache(BaseCache):
         redis: Redis = None,
         expiry: int = 604800,
         cache_key_prefix: str = "fsspec-redis-cache",
+        maxchunks: int = 0,
+        compressor: str | Codec | None = None,
+        alignment: int = 0,
     ) -> None:
         super().__init__(blocksize, fetcher, size)
         self.redis = redis
         self.filename = filename
         self.expiry = expiry
         self.cache_key_prefix = cache_key_prefix
+        # Deeply nested reference paths make for long keys, hashing the
+        # filename keeps every chunk key the same short length
+        self._key_prefix = f"{cache_key_prefix}-".encode() + path_digest(str(filename)) + b"-"
+        self.maxchunks = maxchunks
+        self._local: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+        self._local_lock = threading.Lock()
+        self.compressor = compressor
+        self._codec = make_codec(compressor)
+        self.alignment = alignment
 
     def _fetch(self, start: int | None, stop: int | None) -> bytes:
         if start is None:
@@ -156,9 +753,46 @@ class RedisChunkCache(BaseCache):
             stop = self.size
         if start >= self.size or start >= stop:
             return b""
-        
-        chunk = self.redis.get(f"{self.cache_key_prefix}-{self.filename}-{start}-{stop}")
+
+        if self.alignment:
+            aligned_start = start // self.alignment * self.alignment
+            aligned_stop = min(-(-stop // self.alignment) * self.alignment, self.size)
+            chunk = self._fetch_chunk(aligned_start, aligned_stop)
+            return chunk[start - aligned_start:stop - aligned_start]
+        return self._fetch_chunk(start, stop)
+
+    def _fetch_chunk(self, start: int, stop: int) -> bytes:
+        """Returns the chunk ``start..stop``, looking it up in memory, then in
+        redis, and filling it using the fetcher."""
+        chunk = self._get_local(start, stop)
         if chunk is None:
-            chunk = self.fetcher(start, stop)
-            self.redis.set(f"{self.cache_key_prefix}-{self.filename}-{start}-{stop}", chunk, ex=self.expiry)
-        return chunk
\ No newline at end of file
+            chunk = self._get_or_fill(
+                self._chunk_key(start, stop),
+                lambda: self.fetcher(start, stop),
+                min(stop, self.size) - start,
+            )
+            self._put_local(start, stop, chunk)
+        return chunk
+
+    def _get_local(self, start: int, stop: int) -> bytes | None:
+        """Returns the in-memory copy of the chunk, None when it is not held
+        locally."""
+        with self._local_lock:
+            chunk = self._local.get((start, stop))
+            if chunk is not None:
+                self._local.move_to_end((start, stop))
+        return chunk
+
+    def _put_local(self, start: int, stop: int, chunk: bytes) -> None:
+        """Keeps an in-memory copy of the chunk, evicting the least recently
+        used chunks past ``maxchunks``."""
+        if not self.maxchunks:
+            return
+        with self._local_lock:
+            self._local[(start, stop)] = chunk
+            self._local.move_to_end((start, stop))
+            while len(self._local) > self.maxchunks:
+                self._local.popitem(last=False)
+
+    def _chunk_key(self, start: int, stop: int) -> bytes:
+        return self._key_prefix + b"%d-%d" % (start, stop)
\ No newline at end of file
@@ -0,0 +1,175 @@
+import struct
+import threading
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# Every payload written with a codec starts with this header: the id of the
+# codec the body is compressed with and the length of the body
+HEADER = struct.Struct(">BI")
+
+# Codec ids
+RAW = 0
+ZSTD = 1
+LZ4 = 2
+
+# Payloads that do not compress below this fraction of their size, like
+# already compressed zarr or HDF5 chunks, are stored raw
+COMPRESSION_RATIO_THRESHOLD = 0.9
+
+
+class Codec(ABC):
+    """Base for the codecs compressing cached payloads.
+
+    Payloads are framed with a ``HEADER`` naming the codec of the body, so
+    compressed payloads can be told apart from payloads that did not
+    compress well enough and were stored raw, and a truncated payload is
+    detected from its length. Subclasses set ``codec_id`` and
+    ``decompress_errors``, the exceptions ``decompress`` raises for a corrupt
+    body, and implement ``compress`` and ``decompress``.
+    """
+
+    codec_id: int
+    decompress_errors: tuple[type[Exception], ...]
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        ...
+
+    def encode(self, data: bytes) -> bytes:
+        compressed = self.compress(data)
+        # Counting the header keeps a framed payload shorter than the data,
+        # so readers without a codec never mistake it for a raw entry
+        if HEADER.size + len(compressed) < COMPRESSION_RATIO_THRESHOLD * len(data):
+            return HEADER.pack(self.codec_id, len(compressed)) + compressed
+        return HEADER.pack(RAW, len(data)) + data
+
+    def decode(self, payload: bytes) -> bytes | None:
+        """Returns the data framed in ``payload``, None when the frame is
+        invalid or uses a codec that is not available."""
+        if len(payload) < HEADER.size:
+            return None
+        codec_id, length = HEADER.unpack_from(payload)
+        if len(payload) != HEADER.size + length:
+            return None
+        body = payload[HEADER.size:]
+        if codec_id == RAW:
+            return body
+        # Entries written by other processes may use another codec
+        codec = self if codec_id == self.codec_id else _codec_by_id(codec_id)
+        if codec is None:
+            return None
+        try:
+            return codec.decompress(body)
+        except codec.decompress_errors:
+            return None
+
+
+class ZstdCodec(Codec):
+    """Compresses cached payloads with zstd.
+
+    The zstd contexts are not thread safe, so each thread gets its own.
+
+    Parameters
+    ----------
+    level : int
+        The zstd compression level.
+    """
+
+    codec_id = ZSTD
+    decompress_errors = (zstandard.ZstdError,) if zstandard is not None else ()
+
+    def __init__(self, level: int = 3) -> None:
+        if zstandard is None:
+            raise ImportError(
+                "zstd compression requires the zstandard package, "
+                "install it with `pip install zstandard`"
+            )
+        self.level = level
+        self._local = threading.local()
+
+    def _compressor(self) -> "zstandard.ZstdCompressor":
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+        return compressor
+
+    def _decompressor(self) -> "zstandard.ZstdDecompressor":
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            decompressor = self._local.decompressor = zstandard.ZstdDecompressor()
+        return decompressor
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor().compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor().decompress(data)
+
+
+class Lz4Codec(Codec):
+    """Compresses cached payloads with lz4.
+
+    lz4 compresses less than zstd but is several times faster, for setups
+    where the codec rather than the network is the bottleneck.
+    """
+
+    codec_id = LZ4
+    # lz4.frame reports corrupt frames as RuntimeError
+    decompress_errors = (RuntimeError,)
+
+    def __init__(self) -> None:
+        if lz4 is None:
+            raise ImportError(
+                "lz4 compression requires the lz4 package, "
+                "install it with `pip install lz4`"
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4.frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4.frame.decompress(data)
+
+
+def make_codec(compressor: "str | Codec | None") -> Codec | None:
+    """Returns the codec for the given compressor name, None for no compression.
+    A codec instance is returned as is, so it can be shared between caches."""
+    if isinstance(compressor, Codec):
+        return compressor
+    if compressor is None or compressor == "none":
+        return None
+    if compressor == "zstd":
+        return ZstdCodec()
+    if compressor == "lz4":
+        return Lz4Codec()
+    raise ValueError(
+        f"Unknown compressor {compressor!r}, expected one of 'none', 'zstd' or 'lz4'"
+    )
+
+
+@lru_cache(maxsize=None)
+def _codec_by_id(codec_id: int) -> Codec | None:
+    """Returns a codec for decoding payloads with the given codec id, None when
+    the id is unknown or the codec's package is not installed."""
+    codec_class = {ZSTD: ZstdCodec, LZ4: Lz4Codec}.get(codec_id)
+    if codec_class is None:
+        return None
+    try:
+        return codec_class()
+    except ImportError:
+        return None
@@ -1,11 +1,16 @@
 import pickle
 
+from functools import lru_cache
 from typing import Any, Callable, ClassVar
 from fsspec import AbstractFileSystem, filesystem
 from fsspec.implementations.cache_mapper import AbstractCacheMapper, create_cache_mapper
-from redis import Redis
 
-from .cache import RedisBlockCache, RedisChunkCache
+from ..utils import redis_client
+from .cache import AdmissionFilter, RedisBlockCache, RedisChunkCache
+from .codec import make_codec
+
+# Number of resolved paths memoized per filesystem instance
+PATH_CACHE_SIZE = 4096
 
 
 class RedisCachingFileSystem(AbstractFileSystem):
@@ -36,6 +41,14 @@ class RedisCachingFileSystem(AbstractFileSystem):
         same_names: bool | None = None,
         compression=None,
         cache_mapper: AbstractCacheMapper | None = None,
+        readahead_blocks=0,
+        maxblocks=0,
+        admission_threshold=0,
+        adaptive_fetch=False,
+        prefetch_prefix=0,
+        compressor=None,
+        chunk_alignment=0,
+        server_assembly=False,
         **kwargs,
     ):
         """
@@ -88,6 +101,52 @@ class RedisCachingFileSystem(AbstractFileSystem):
         cache_mapper: AbstractCacheMapper (optional)
             The object use to map from original filenames to cached filenames.
             Only one of this and ``same_names`` should be specified.
+        readahead_blocks: int
+            The number of blocks to prefetch in the background when a file is
+            read sequentially. Each read-ahead fetches up to this many blocks
+            from the target filesystem speculatively. Only used with the
+            'block' method. The default of 0 disables read-ahead.
+        maxblocks: int
+            The number of recently used blocks of each open file to keep in
+            memory in front of redis, or of recently read chunks with the
+            'chunk' method. This costs up to ``maxblocks * block_size`` bytes
+            per open file, e.g. 1.6 GiB for 32 blocks of s3fs's default 50 MiB
+            block size, and blocks held in memory are still served after the
+            redis cache is invalidated. The default of 0 always reads from
+            redis.
+        admission_threshold: int
+            The number of times a block has to miss before it is written to
+            redis, which keeps one-off scans from evicting hot blocks. Only
+            used with the 'block' method. Misses are counted across every
+            open of a file by this filesystem. The default of 0 caches every
+            block on its first miss.
+        adaptive_fetch: bool
+            Whether to track hits and misses of each file in redis and fetch
+            more blocks per miss on later opens of files whose reads keep
+            missing long runs of blocks. Only used with the 'block' method.
+        prefetch_prefix: int
+            The number of bytes at the start of each file to load into
+            memory in one request when the file is opened, which saves the
+            round trips of the many small header reads formats like zarr,
+            netCDF or COG make. The prefix stays in memory until the file is
+            closed, whatever ``maxblocks`` is. Can also be given per open.
+            Only used with the 'block' method. The default of 0 disables
+            this.
+        compressor: str or Codec (optional)
+            The codec to compress cached blocks or chunks with in redis, one
+            of 'none', 'zstd' or 'lz4', or a codec instance. 'zstd' requires
+            the zstandard package and 'lz4' the lz4 package. Data that does
+            not compress well is stored raw. Not to be confused with
+            ``compression``.
+        chunk_alignment: int
+            Widen requested ranges to multiples of this many bytes before
+            caching them, so overlapping reads that do not match byte for
+            byte share one cached chunk. Only used with the 'chunk' method.
+            The default of 0 caches the exact ranges requested.
+        server_assembly: bool
+            Concatenate the blocks of each read on the redis server with a
+            Lua script, so reads spanning many blocks get a single reply.
+            Only used with the 'block' method and without a compressor.
         """
         super().__init__(**kwargs)
         if fs is None and target_protocol is None:
@@ -106,6 +165,18 @@ class RedisCachingFileSystem(AbstractFileSystem):
         self.compression = compression
         self.method = method
         self.cache_key_prefix = cache_key_prefix
+        self.readahead_blocks = readahead_blocks
+        self.maxblocks = maxblocks
+        self.admission_threshold = admission_threshold
+        self._admission = AdmissionFilter(admission_threshold)
+        self.adaptive_fetch = adaptive_fetch
+        self.prefetch_prefix = prefetch_prefix
+        self.compressor = compressor
+        # One codec shared by the caches of every open file, which also
+        # rejects unknown compressors here rather than on the first open
+        self._codec = make_codec(compressor)
+        self.chunk_alignment = chunk_alignment
+        self.server_assembly = server_assembly
 
         if same_names is not None and cache_mapper is not None:
             raise ValueError(
@@ -118,11 +189,12 @@ class RedisCachingFileSystem(AbstractFileSystem):
             self._mapper = create_cache_mapper(
                 same_names if same_names is not None else False
             )
+        self.hash_name = lru_cache(maxsize=PATH_CACHE_SIZE)(self.hash_name)
 
         if redis is not None:
             self.redis = redis
         else:
-            self.redis = Redis(host=redis_host, port=redis_port, db=0)
+            self.redis = redis_client(redis_host, redis_port)
 
         self.target_protocol = (
             target_protocol
@@ -131,9 +203,20 @@ class RedisCachingFileSystem(AbstractFileSystem):
         )
         self.fs = fs if fs is not None else filesystem(target_protocol, **self.kwargs)
 
+        base_strip_protocol = type(self)._strip_protocol
+        fs_strip_protocol = self.fs._strip_protocol
+
+        @lru_cache(maxsize=PATH_CACHE_SIZE)
+        def _strip_str_protocol(path):
+            return fs_strip_protocol(base_strip_protocol(path))
+
         def _strip_protocol(path):
-            # acts as a method, since each instance has a difference target
-            return self.fs._strip_protocol(type(self)._strip_protocol(path))
+            # acts as a method, since each instance has a difference target.
+            # Resolving is a pure function of the path, so string paths are
+            # memoized; lists of paths are not hashable
+            if isinstance(path, str):
+                return _strip_str_protocol(path)
+            return fs_strip_protocol(base_strip_protocol(path))
 
         self._strip_protocol: Callable = _strip_protocol
 
@@ -169,9 +252,9 @@ class RedisCachingFileSystem(AbstractFileSystem):
         """
 
         path = path if path != "" else self.to_open
+        # also strips the target protocol, no need to strip again
         path = self._strip_protocol(path)
-
-        path = self.fs._strip_protocol(path)
+        prefetch_prefix = kwargs.pop("prefetch_prefix", self.prefetch_prefix)
         if "r" not in mode:
             # When not reading, just pass through
             return self.fs._open(
@@ -195,9 +278,37 @@ class RedisCachingFileSystem(AbstractFileSystem):
 
         # TODO: compression
         if self.method == "block":
-            f.cache = RedisBlockCache(f.blocksize, f._fetch_range, f.size, path, self.redis, self.expiry, self.cache_key_prefix)
+            f.cache = RedisBlockCache(
+                f.blocksize,
+                f._fetch_range,
+                f.size,
+                path,
+                self.redis,
+                self.expiry,
+                self.cache_key_prefix,
+                readahead_blocks=self.readahead_blocks,
+                maxblocks=self.maxblocks,
+                admission_threshold=self.admission_threshold,
+                admission=self._admission,
+                adaptive_fetch=self.adaptive_fetch,
+                compressor=self._codec,
+                server_assembly=self.server_assembly,
+            )
+            if prefetch_prefix:
+                f.cache.prefetch(0, prefetch_prefix)
         elif self.method == "chunk":
-            f.cache = RedisChunkCache(f.blocksize, f._fetch_range, f.size, path, self.redis, self.expiry, self.cache_key_prefix)
+            f.cache = RedisChunkCache(
+                f.blocksize,
+                f._fetch_range,
+                f.size,
+                path,
+                self.redis,
+                self.expiry,
+                self.cache_key_prefix,
+                maxchunks=self.maxblocks,
+                compressor=self._codec,
+                alignment=self.chunk_alignment,
+            )
         return f
 
     def hash_name(self, path: str, *args: Any) -> str:
@@ -0,0 +1,80 @@
+import hashlib
+import os
+import warnings
+
+from redis import BlockingConnectionPool, Redis
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool
+from redis.asyncio import Redis as AsyncRedis
+
+try:
+    import hiredis  # noqa: F401
+except ImportError:
+    warnings.warn(
+        "hiredis is not installed, redis responses will be parsed by the much "
+        "slower pure python parser. Install it with `pip install hiredis`",
+        stacklevel=2,
+    )
+
+# Connection pools shared by every sync client connecting to the same redis
+# instance, keyed by (host, port, db). Async pools are not shared, their
+# connections belong to the event loop that opened them
+_POOLS: dict[tuple, BlockingConnectionPool] = {}
+
+# Size of the connection pools. Read-ahead threads and concurrent async reads
+# each hold a connection while they run, callers waiting for a free one
+# block instead of failing
+MAX_CONNECTIONS = max(32, (os.cpu_count() or 1) * 4)
+
+_POOL_OPTIONS = {
+    "max_connections": MAX_CONNECTIONS,
+    # cached values are raw file bytes, never decode them
+    "decode_responses": False,
+    "socket_keepalive": True,
+    "socket_read_size": 65536,
+}
+
+# Number of keys scanned and unlinked per round trip when invalidating a cache
+INVALIDATE_BATCH_SIZE = 500
+
+
+def redis_client(host: str, port: int, db: int = 0) -> Redis:
+    """
+    Returns a redis client using the connection pool shared for the given
+    host, port and db.
+
+    The pool holds at most MAX_CONNECTIONS connections. When more threads
+    than that read at once, for example many open files each with read-ahead
+    enabled, pass a client with a larger pool instead, e.g.
+    ``Redis(connection_pool=BlockingConnectionPool(max_connections=...))``.
+    """
+    key = (host, int(port), db)
+    pool = _POOLS.get(key)
+    if pool is None:
+        pool = _POOLS.setdefault(
+            key, BlockingConnectionPool(host=host, port=int(port), db=db, **_POOL_OPTIONS)
+        )
+    return Redis(connection_pool=pool)
+
+
+def async_redis_client(host: str, port: int, db: int = 0) -> AsyncRedis:
+    """
+    Returns an async redis client with a connection pool of its own for the
+    given host, port and db.
+
+    Unlike ``redis_client`` the pool is not shared: asyncio connections can
+    only be used on the event loop that opened them, and a process may run
+    several loops one after the other. The pool holds at most
+    MAX_CONNECTIONS connections, which bounds the number of concurrent redis
+    commands. Pass a client with a larger pool to run more concurrent reads
+    than that.
+    """
+    pool = AsyncBlockingConnectionPool(host=host, port=int(port), db=db, **_POOL_OPTIONS)
+    return AsyncRedis(connection_pool=pool)
+
+
+def path_digest(path: str) -> bytes:
+    """
+    Returns a short fixed length digest of the given path, to keep cache keys
+    small no matter how deeply nested the path is.
+    """
+    return hashlib.blake2b(path.encode(), digest_size=16).hexdigest().encode()